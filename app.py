@@ -22,7 +22,7 @@ def main():
         sys.exit(1)
 
     rows = summarize_kml_folder(args.in_folder)
-    if not rows:
+    if not len(rows):
         print("No polygons found in KML files.", file=sys.stderr)
     write_csv(rows, args.out_csv)
     print(f"Done. Wrote {len(rows)} rows to {args.out_csv}")
@@ -0,0 +1,26 @@
+"""
+build_kernels.py
+----------------
+Ahead-of-time compile area kernels specialised for fixed vertex counts
+(kml_area_jit.FIXED_SIZES) into a `kml_kernels` extension module next to
+this file. kml_area picks it up automatically when present; without it the
+generic Numba/NumPy kernels are used. Needs Numba and a C compiler.
+
+Usage:
+    python build_kernels.py
+"""
+import os
+
+from numba.pycc import CC
+
+from kml_area_jit import FIXED_SIZES, make_fixed_area_kernel
+
+cc = CC("kml_kernels")
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+for n in FIXED_SIZES:
+    # (K, n, 3) C-contiguous batch of unit vectors -> K unit-sphere areas
+    cc.export(f"area_n{n}", "f8[:](f8[:, :, ::1])")(make_fixed_area_kernel(n))
+
+if __name__ == "__main__":
+    cc.compile()
@@ -3,166 +3,482 @@
 kml_area.py
 -----------
 Utilities to parse KML Polygon placemarks and compute areas (in hectares)
-and approximate centroid (lat, lon). No third-party deps.
+and approximate centroid (lat, lon). The only third-party dependency is NumPy.
 """
 
-from xml.etree import ElementTree as ET
-from typing import List, Tuple, Dict, Optional
+from typing import BinaryIO, List, Tuple, Dict, Optional, Sequence, Iterable, Iterator
+import io
 import math
+import mmap
 import os
+import warnings
 import csv
+import functools
+from collections import deque
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    # lxml parses faster when installed; the stdlib parser has the same target API.
+    # Entity resolution and network access are pinned off because uploads are
+    # untrusted: lxml < 5.0 resolves external entities by default, which would
+    # copy local files (e.g. <!ENTITY x SYSTEM "file:///...">) into Plot_ID.
+    from lxml import etree as ET
+    _PARSER_OPTIONS = {"huge_tree": False, "resolve_entities": False, "no_network": True}
+except ImportError:
+    from xml.etree import ElementTree as ET
+    _PARSER_OPTIONS = {}
+
+try:
+    # Numba-compiled kernels; optional, the NumPy functions below are the fallback
+    from kml_area_jit import _area_kernel, _centroid_kernel
+except ImportError:
+    _area_kernel = _centroid_kernel = None
+
+try:
+    # Fixed-vertex-count kernels compiled ahead of time by build_kernels.py; optional
+    import kml_kernels
+    _FIXED_AREA_KERNELS = {int(name[len("area_n"):]): fn for name, fn in vars(kml_kernels).items()
+                           if name.startswith("area_n")}
+except ImportError:
+    _FIXED_AREA_KERNELS = {}
 
 # Earth radius (meters)
 EARTH_RADIUS = 6371008.8  # IUGG mean Earth radius
 
+# Output CSV columns; rows are tuples in this order
+FIELDS = ("Plot_ID", "Area_ha", "Latitude", "Longitude", "Source_File")
+# Record layout of summarized results; the string columns hold Python str
+# objects so IDs and paths of any length are kept whole
+REC_DTYPE = np.dtype([("Plot_ID", object), ("Area_ha", "f8"), ("Latitude", "f8"),
+                      ("Longitude", "f8"), ("Source_File", object)])
+
 # KML namespace handling
 KML_NS = {"kml": "http://www.opengis.net/kml/2.2"}
+# Clark-notation ({uri}tag) names, so find() needs no prefix lookup per call
+NS = "{%s}" % KML_NS["kml"]
+PLACEMARK = NS + "Placemark"
+NAME = NS + "name"
+# Element path, below a Placemark, of the outer boundary coordinates
+COORDS_TAGS = [NS + "Polygon", NS + "outerBoundaryIs", NS + "LinearRing", NS + "coordinates"]
 
-def _unwrap_lons(lons: List[float]) -> List[float]:
-    """Unwrap longitudes to avoid large jumps across the dateline for area calc."""
-    unwrapped = [lons[0]]
-    for i in range(1, len(lons)):
-        d = lons[i] - lons[i-1]
-        if d > 180:
-            unwrapped.append(unwrapped[-1] + (d - 360))
-        elif d < -180:
-            unwrapped.append(unwrapped[-1] + (d + 360))
-        else:
-            unwrapped.append(unwrapped[-1] + d)
-    # Convert back to absolute longitudes relative to the first
-    base = lons[0]
-    result = [base + (u - unwrapped[0]) for u in unwrapped]
-    return result
-
-def spherical_polygon_area_sq_m(lats_deg: List[float], lons_deg: List[float]) -> float:
-    """
-    Approximate area of a (small) spherical polygon on Earth using
-    the l'Huilier/Chamberlain-Duquette style formula.
-    Vertices must be ordered and the polygon closed (first==last). If not closed,
-    the function will close it.
+def _polygon_vectors(lats_deg: Sequence[float], lons_deg: Sequence[float]) -> np.ndarray:
+    """Unit vectors (..., 3) on the sphere for the given vertex lat/lons in degrees."""
+    lat = np.radians(np.asarray(lats_deg, dtype=np.float64))
+    lon = np.radians(np.asarray(lons_deg, dtype=np.float64))
+    cl = np.cos(lat)
+    return np.stack([cl * np.cos(lon), cl * np.sin(lon), np.sin(lat)], axis=-1)
+
+def _fan_factors(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """
+    Unit complex numbers den + i*num, one per fan triangle. A triangle's
+    excess is 2*arg(z), so the polygon's is 2*arg of their product: one
+    atan2 per polygon. Normalizing keeps long products from overflowing.
+    """
+    z = den + 1j * num
+    mag = np.abs(z)
+    return np.where(mag > 0.0, z / np.where(mag > 0.0, mag, 1.0), 1.0)
+
+def _area_from_vectors(V: np.ndarray) -> float:
+    """
+    Area on the unit sphere of the polygon with unit-vector vertices V, summed
+    over a fan of triangles from V[0]. The fan closes the polygon implicitly.
+    Polygons larger than a hemisphere come out as the area of their complement.
+    """
+    if len(V) < 3:
+        return 0.0
+    # Signed excess of triangle (v0, a, b):
+    # tan(E/2) = v0 . (a x b) / (1 + v0.a + v0.b + a.b)
+    v0 = V[0]
+    A = V[1:-1]
+    B = V[2:]
+    cx = A[:, 1] * B[:, 2] - A[:, 2] * B[:, 1]
+    cy = A[:, 2] * B[:, 0] - A[:, 0] * B[:, 2]
+    cz = A[:, 0] * B[:, 1] - A[:, 1] * B[:, 0]
+    num = v0[0] * cx + v0[1] * cy + v0[2] * cz
+    den = 1.0 + A @ v0 + B @ v0 + np.einsum("ij,ij->i", A, B)
+    z = np.prod(_fan_factors(num, den))
+    return abs(2.0 * math.atan2(z.imag, z.real))
+
+def _centroid_from_vectors(V: np.ndarray) -> Tuple[float, float]:
+    """Centroid (lat, lon) in degrees of unit-vector vertices V, via their mean."""
+    if len(V) == 0:
+        return (0.0, 0.0)
+    x, y, z = V.mean(axis=0)
+    hyp = math.hypot(x, y)
+    lat = math.degrees(math.atan2(z, hyp))
+    lon = math.degrees(math.atan2(y, x))
+    return (lat, lon)
+
+def spherical_polygon_area_sq_m(lats_deg: Sequence[float], lons_deg: Sequence[float]) -> float:
+    """
+    Area of a spherical polygon on Earth, summed exactly over a fan of
+    spherical triangles from the first vertex (Van Oosterom & Strackee).
+    Vertices must be ordered; the polygon may be given closed (first==last)
+    or open, since the fan closes it implicitly and a repeated last vertex
+    only adds an empty triangle.
     Returns area in square meters.
     """
     if len(lats_deg) < 3:
         return 0.0
-    # Ensure closed polygon
-    if lats_deg[0] != lats_deg[-1] or lons_deg[0] != lons_deg[-1]:
-        lats_deg = lats_deg + [lats_deg[0]]
-        lons_deg = lons_deg + [lons_deg[0]]
-
-    # Unwrap longitudes to avoid jumps
-    lons_deg = _unwrap_lons(lons_deg)
-
-    lats = [math.radians(lat) for lat in lats_deg]
-    lons = [math.radians(lon) for lon in lons_deg]
-
-    # Spherical excess approximation
-    # Area on unit sphere ≈ 0.5 * sum( (lon_{i+1} - lon_i) * (sin(lat_{i+1}) + sin(lat_i)) )
-    # Then multiply by R^2 for square meters. Take absolute value.
-    total = 0.0
-    for i in range(len(lats) - 1):
-        lon1, lon2 = lons[i], lons[i+1]
-        lat1, lat2 = lats[i], lats[i+1]
-        total += (lon2 - lon1) * (math.sin(lat1) + math.sin(lat2))
-    area_on_unit_sphere = 0.5 * abs(total)
+
+    # Working on unit vectors needs no longitude unwrapping.
+    # Multiply the unit-sphere area by R^2 for square meters.
+    area_on_unit_sphere = _area_from_vectors(_polygon_vectors(lats_deg, lons_deg))
     area_sq_m = area_on_unit_sphere * (EARTH_RADIUS ** 2)
     return area_sq_m
 
-def centroid_latlon(lats_deg: List[float], lons_deg: List[float]) -> Tuple[float, float]:
+def centroid_latlon(lats_deg: Sequence[float], lons_deg: Sequence[float]) -> Tuple[float, float]:
     """
     Approximate centroid by averaging 3D Cartesian coordinates on the unit sphere,
     then converting back to lat/lon.
     """
-    if not lats_deg:
+    if len(lats_deg) == 0:
         return (0.0, 0.0)
+    return _centroid_from_vectors(_polygon_vectors(lats_deg, lons_deg))
 
-    x = y = z = 0.0
-    for lat_deg, lon_deg in zip(lats_deg, lons_deg):
-        lat = math.radians(lat_deg)
-        lon = math.radians(lon_deg)
-        x += math.cos(lat) * math.cos(lon)
-        y += math.cos(lat) * math.sin(lon)
-        z += math.sin(lat)
-    n = len(lats_deg)
-    x /= n
-    y /= n
-    z /= n
-    hyp = math.hypot(x, y)
-    lat = math.degrees(math.atan2(z, hyp))
-    lon = math.degrees(math.atan2(y, x))
-    return (lat, lon)
+def _batch_vectors(polygons: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unit vectors for a batch of polygons, zero-padded to a (K, Nmax, 3) array,
+    plus each polygon's vertex count. Padding vertices must be masked out.
+    """
+    counts = np.array([len(p["lats"]) for p in polygons], dtype=np.int64)
+    mask = np.arange(counts.max()) < counts[:, None]
+    lats = np.zeros(mask.shape)
+    lons = np.zeros(mask.shape)
+    # Boolean assignment fills row by row, matching the concatenation order
+    lats[mask] = np.concatenate([p["lats"] for p in polygons])
+    lons[mask] = np.concatenate([p["lons"] for p in polygons])
+    return _polygon_vectors(lats, lons), counts
+
+def _batch_areas(V: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Unit-sphere areas (K,) of padded polygons V, as _area_from_vectors per row."""
+    v0 = V[:, :1]
+    A = V[:, 1:-1]
+    B = V[:, 2:]
+    num = np.einsum("kij,kij->ki", np.broadcast_to(v0, A.shape), np.cross(A, B))
+    den = 1.0 + np.einsum("kij,kij->ki", A, v0 + B) + np.einsum("kij,kj->ki", B, V[:, 0])
+    # Triangle (v0, v_i, v_i+1) is real only if v_i+1 is a real vertex
+    valid = np.arange(2, V.shape[1]) < counts[:, None]
+    z = np.where(valid, _fan_factors(num, den), 1.0).prod(axis=1)
+    return np.abs(2.0 * np.arctan2(z.imag, z.real))
+
+def _batch_centroids(V: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Centroid lats, lons (K,) in degrees of padded polygons V, as _centroid_from_vectors per row."""
+    mask = np.arange(V.shape[1]) < counts[:, None]
+    m = np.einsum("kij,ki->kj", V, mask) / counts[:, None]
+    lat = np.degrees(np.arctan2(m[:, 2], np.hypot(m[:, 0], m[:, 1])))
+    lon = np.degrees(np.arctan2(m[:, 1], m[:, 0]))
+    return lat, lon
+
+def _polygon_areas_and_centroids(polygons: List[Dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return arrays (area_sq_m, lat, lon) for a batch of polygons. Polygons are
+    grouped by vertex count so each padded array holds no padding, keeping
+    memory proportional to the real vertex count; within a group the unit
+    vectors are built in one pass and shared by both calculations, using the
+    JIT kernels when available.
+    """
+    counts = np.array([len(p["lats"]) for p in polygons], dtype=np.int64)
+    areas = np.empty(len(polygons))
+    lat_c = np.empty(len(polygons))
+    lon_c = np.empty(len(polygons))
+    order = np.argsort(counts, kind="stable")
+    starts = np.flatnonzero(np.diff(counts[order], prepend=-1))
+    for idx in np.split(order, starts[1:]):
+        V, group_counts = _batch_vectors([polygons[i] for i in idx])
+        # Groups of grid plots may have a dedicated fixed-size kernel
+        fixed = _FIXED_AREA_KERNELS.get(V.shape[1])
+        if fixed is not None:
+            areas[idx] = fixed(V)
+        elif _area_kernel is not None:
+            areas[idx] = _area_kernel(V, group_counts)
+        else:
+            areas[idx] = _batch_areas(V, group_counts)
+        if _centroid_kernel is not None:
+            lat_c[idx], lon_c[idx] = _centroid_kernel(V, group_counts)
+        else:
+            lat_c[idx], lon_c[idx] = _batch_centroids(V, group_counts)
+    return areas * (EARTH_RADIUS ** 2), lat_c, lon_c
 
 def parse_kml_polygons(kml_path: str) -> List[Dict]:
     """
     Parse KML file and return a list of dicts with keys:
       - id: Placemark name or id
-      - coords: list of (lat, lon) tuples for outer boundary
+      - lats, lons: float64 arrays of the outer boundary vertices (degrees)
     Only handles <Polygon> with <outerBoundaryIs>.
     """
-    results = []
-    try:
-        tree = ET.parse(kml_path)
-        root = tree.getroot()
-    except ET.ParseError:
-        return results  # skip bad file
+    with open(kml_path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []  # empty file
+        with mm:
+            if not _may_have_polygon(mm):
+                return []
+            return parse_kml_stream(mm, kml_path)
 
-    # Find all Placemark elements
-    for pm in root.findall(".//kml:Placemark", namespaces=KML_NS):
-        # Find name
-        name_el = pm.find("kml:name", namespaces=KML_NS)
-        pid = name_el.text.strip() if (name_el is not None and name_el.text) else os.path.basename(kml_path)
+def _may_have_polygon(data) -> bool:
+    """
+    Cheap pre-scan of raw KML bytes (bytes or mmap): False only when the
+    document certainly has no Polygon (e.g. Points only), so it can skip the
+    XML parser. Matches prefixed tags like <kml:Polygon> too. The byte search
+    only works for ASCII-compatible encodings, so UTF-16/32 documents (a BOM
+    or NUL bytes at the start) always go to the parser.
+    """
+    head = data[:4]
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")) or b"\x00" in head:
+        return True
+    return data.find(b"Polygon") != -1
 
-        # Find polygon outer boundary
-        coords_el = pm.find(".//kml:Polygon/kml:outerBoundaryIs/kml:LinearRing/kml:coordinates", namespaces=KML_NS)
-        if coords_el is None or not coords_el.text:
-            continue
+class KMLTarget:
+    """
+    Parser target that collects (name, coordinates text) for each Placemark
+    with a Polygon outer boundary, without building an element tree. The
+    name is None when the Placemark has none.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.results = []
+        self.name = self.coords = None
+        self.buf = None  # text chunks of the element being captured
 
-        # KML coordinates are "lon,lat[,alt]" separated by spaces (and/or newlines)
-        raw = coords_el.text.strip()
-        parts = [p for p in raw.replace("\n", " ").split(" ") if p]
-        lats, lons = [], []
-        for p in parts:
+    def start(self, tag, attrib):
+        self.stack.append(tag)
+        if tag == PLACEMARK:
+            self.name = self.coords = None
+        elif tag == NAME and len(self.stack) > 1 and self.stack[-2] == PLACEMARK:
+            self.buf = []
+        elif (tag == COORDS_TAGS[-1] and self.coords is None
+              and self.stack[-4:] == COORDS_TAGS and PLACEMARK in self.stack[:-4]):
+            # Only the first outer boundary of a Placemark counts
+            self.buf = []
+
+    def data(self, text):
+        if self.buf is not None:
+            self.buf.append(text)
+
+    def end(self, tag):
+        self.stack.pop()
+        if self.buf is not None:
+            text = "".join(self.buf).strip()
+            self.buf = None
+            if tag == NAME:
+                self.name = text or None
+            else:
+                self.coords = text
+        elif tag == PLACEMARK and self.coords:
+            self.results.append((self.name, self.coords))
+
+    def close(self):
+        return self.results
+
+def _decode_coordinates(raw: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Decode a KML coordinates string into (lats, lons) arrays, or None if
+    fewer than 3 vertices are valid. Malformed tuples are skipped.
+    """
+    # KML coordinates are "lon,lat[,alt]" separated by whitespace
+    parts = raw.split()
+    stride = parts[0].count(",") + 1
+    if stride >= 2 and all(p.count(",") == stride - 1 for p in parts):
+        # Every tuple has the same shape: decode them all in one call
+        with warnings.catch_warnings():
+            # NumPy 1.x warns and truncates on non-numeric text instead of raising
+            warnings.simplefilter("ignore", DeprecationWarning)
             try:
-                lon_str, lat_str, *_ = p.split(",")
-                lon = float(lon_str)
-                lat = float(lat_str)
-                lats.append(lat)
-                lons.append(lon)
-            except Exception:
-                continue
-
-        if len(lats) >= 3:
-            results.append({"id": pid, "lats": lats, "lons": lons})
+                flat = np.fromstring(raw.replace(",", " "), sep=" ", dtype=np.float64)
+            except ValueError:
+                flat = None
+        if flat is not None and flat.size == len(parts) * stride:
+            arr = flat.reshape(-1, stride)
+            if len(arr) < 3:
+                return None
+            return arr[:, 1], arr[:, 0]
+
+    # Mixed 2D/3D tuples or bad values: decode tuple by tuple, keeping the valid ones
+    lats, lons = [], []
+    for p in parts:
+        try:
+            lon_str, lat_str, *_ = p.split(",")
+            lon = float(lon_str)
+            lat = float(lat_str)
+        except ValueError:
+            continue
+        lats.append(lat)
+        lons.append(lon)
+    if len(lats) < 3:
+        return None
+    return np.array(lats), np.array(lons)
+
+def parse_kml_stream(fileobj: BinaryIO, source_name: str) -> List[Dict]:
+    """
+    Like parse_kml_polygons, but reads KML from any binary file-like object
+    (e.g. a zip member). `source_name` stands in for the file path in the
+    Plot_ID fallback.
+    """
+    parser = ET.XMLParser(target=KMLTarget(), **_PARSER_OPTIONS)
+    try:
+        for chunk in iter(functools.partial(fileobj.read, 1 << 16), b""):
+            parser.feed(chunk)
+        placemarks = parser.close()
+    except ET.ParseError:
+        return []  # skip bad file
+
+    results = []
+    for name, raw in placemarks:
+        decoded = _decode_coordinates(raw)
+        if decoded is not None:
+            lats, lons = decoded
+            results.append({"id": name or os.path.basename(source_name), "lats": lats, "lons": lons})
     return results
 
-def summarize_kml_folder(folder: str) -> List[Dict]:
+def _rows_for_polygons(polygons: List[Dict], source: str) -> List[Tuple]:
+    """FIELDS-ordered rows for the polygons parsed from one file, computed in one batch."""
+    if not polygons:
+        return []
+    areas_m2, lats_c, lons_c = _polygon_areas_and_centroids(polygons)
+    areas_ha = areas_m2 / 10000.0
+    return [
+        (poly["id"], round(area_ha, 4), round(lat_c, 6), round(lon_c, 6), source)
+        for poly, area_ha, lat_c, lon_c in zip(polygons, areas_ha.tolist(), lats_c.tolist(), lons_c.tolist())
+    ]
+
+def parse_and_compute(fpath: str, folder: str) -> List[Tuple]:
+    """
+    Parse one .kml file and compute area (ha) and centroid for each polygon.
+    Returns its rows as FIELDS-ordered tuples, with Source_File relative to
+    `folder`. Module-level so it can be shipped to worker processes.
+    """
+    return _rows_for_polygons(parse_kml_polygons(fpath), os.path.relpath(fpath, folder))
+
+def _parse_and_compute_bytes(data: bytes, source_name: str) -> List[Tuple]:
+    """parse_and_compute for KML content already read into memory."""
+    if not _may_have_polygon(data):
+        return []
+    return _rows_for_polygons(parse_kml_stream(io.BytesIO(data), source_name), source_name)
+
+def _iter_kml(root: str) -> Iterator[str]:
+    """
+    Yield paths of all .kml files under `root`, like os.walk but on cached
+    DirEntry types: each directory's files come before its subdirectories,
+    and unreadable directories are skipped.
+    """
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except OSError:
+        return
+    subdirs = []
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            subdirs.append(e.path)
+        elif e.name.lower().endswith(".kml") and e.is_file():
+            yield e.path
+    for d in subdirs:
+        yield from _iter_kml(d)
+
+def _collect_records(file_rows: Iterable[List[Tuple]], size_hint: int) -> np.ndarray:
+    """
+    Pack per-file row lists into a REC_DTYPE structured array, starting from
+    `size_hint` records and doubling the buffer whenever it fills up.
+    """
+    arr = np.empty(max(size_hint, 16), dtype=REC_DTYPE)
+    n = 0
+    for rows in file_rows:
+        for r in rows:
+            if n == len(arr):
+                grown = np.empty(2 * len(arr), dtype=REC_DTYPE)
+                grown[:n] = arr
+                arr = grown
+            arr[n] = r
+            n += 1
+    return arr[:n]
+
+def summarize_kml_folder(folder: str, pool: Optional[Executor] = None) -> np.ndarray:
     """
     Walk a folder, parse all .kml files, compute area (ha) and centroid for each polygon.
-    Returns a list of rows: {"Plot_ID","Area_ha","Latitude","Longitude","Source_File"}
-    """
-    rows = []
-    for root, _, files in os.walk(folder):
-        for fname in files:
-            if not fname.lower().endswith(".kml"):
-                continue
-            fpath = os.path.join(root, fname)
-            polygons = parse_kml_polygons(fpath)
-            for poly in polygons:
-                area_m2 = spherical_polygon_area_sq_m(poly["lats"], poly["lons"])
-                area_ha = area_m2 / 10000.0
-                lat_c, lon_c = centroid_latlon(poly["lats"], poly["lons"])
-                rows.append({
-                    "Plot_ID": poly["id"],
-                    "Area_ha": round(area_ha, 4),
-                    "Latitude": round(lat_c, 6),
-                    "Longitude": round(lon_c, 6),
-                    "Source_File": os.path.relpath(fpath, folder)
-                })
-    return rows
-
-def write_csv(rows: List[Dict], out_csv: str) -> None:
+    Files are processed in parallel across CPU cores, on `pool` if given
+    (left running for reuse) or else on a pool created for this call.
+    Returns a REC_DTYPE structured array with one record per polygon.
+    """
+    paths = list(_iter_kml(folder))
+    work = functools.partial(parse_and_compute, folder=folder)
+    # At least one polygon per file is the usual case
+    if pool is not None:
+        return _collect_records(pool.map(work, paths, chunksize=16), len(paths))
+    if len(paths) < 2:
+        # Not worth starting worker processes
+        return _collect_records(map(work, paths), len(paths))
+    with ProcessPoolExecutor() as ex:
+        return _collect_records(ex.map(work, paths, chunksize=16), len(paths))
+
+def _bounded_map(pool: Executor, fn, jobs: Iterable[Tuple]) -> Iterator:
+    """
+    Like pool.map(fn, *zip(*jobs)), but pulls from `jobs` only as workers
+    free up: at most two tasks per worker are in flight, so large argument
+    payloads are never all held in memory at once. Results keep job order.
+    """
+    window = 2 * (getattr(pool, "_max_workers", None) or os.cpu_count() or 1)
+    pending = deque()
+    for args in jobs:
+        pending.append(pool.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def summarize_kml_zip(zf: zipfile.ZipFile, pool: Optional[Executor] = None) -> np.ndarray:
+    """
+    summarize_kml_folder for the .kml members of an open zip archive, read
+    straight from the archive without extracting to disk. Source_File is the
+    member name. With `pool`, members are read into memory a few at a time
+    and handed to its workers.
+    """
+    members = [info for info in zf.infolist() if not info.is_dir() and info.filename.lower().endswith(".kml")]
+    if pool is not None:
+        jobs = ((zf.read(info), info.filename) for info in members)
+        return _collect_records(_bounded_map(pool, _parse_and_compute_bytes, jobs), len(members))
+
+    def member_rows() -> Iterator[List[Tuple]]:
+        for info in members:
+            with zf.open(info) as fh:
+                polygons = parse_kml_stream(fh, info.filename)
+            yield _rows_for_polygons(polygons, info.filename)
+    return _collect_records(member_rows(), len(members))
+
+def write_csv(rows, out_csv: str) -> int:
+    """
+    Write rows (a REC_DTYPE array, FIELDS-ordered tuples, or a DataFrame with
+    FIELDS columns) to `out_csv`; returns the number of rows written. Uses
+    pandas' C writer when pandas is installed, else the csv module.
+    """
     os.makedirs(os.path.dirname(out_csv), exist_ok=True)
-    with open(out_csv, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["Plot_ID","Area_ha","Latitude","Longitude","Source_File"])
-        writer.writeheader()
+    try:
+        # Imported here so jobs that never write a CSV don't pay for it
+        import pandas as pd
+    except ImportError:
+        pd = None
+    if isinstance(rows, np.ndarray):
+        # Whole columns at once for pandas, plain tuples for csv
+        rows = pd.DataFrame(rows) if pd is not None else rows.tolist()
+
+    if pd is not None:
+        df = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame.from_records(rows, columns=FIELDS)
+        df.to_csv(out_csv, index=False, encoding="utf-8", lineterminator="\r\n")
+        return len(df)
+
+    count = 0
+    def counted() -> Iterator[Tuple]:
+        nonlocal count
         for r in rows:
-            writer.writerow(r)
+            count += 1
+            yield r
+    with open(out_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        writer.writerows(counted())
+    return count
@@ -0,0 +1,110 @@
+"""
+kml_area_jit.py
+---------------
+Numba-compiled versions of the area and centroid maths in kml_area.py.
+Optional: kml_area falls back to its NumPy implementations if Numba is
+not installed.
+"""
+
+import math
+
+import numpy as np
+from numba import njit
+
+
+# Vertex counts (closing vertex included) that build_kernels.py compiles
+# dedicated kernels for: 4-, 8- and 16-sided grid plots.
+FIXED_SIZES = (5, 9, 17)
+
+
+@njit(cache=True, inline="always")
+def _fan_area(V, k, n):
+    """
+    Unit-sphere area of polygon k, with n vertices, in a zero-padded
+    (K, Nmax, 3) float64 array of unit vectors. Same Van Oosterom & Strackee
+    triangle fan as kml_area._area_from_vectors; the fan closes the polygon
+    implicitly, so a repeated last vertex only adds an empty triangle.
+    Polygons larger than a hemisphere come out as the area of their complement.
+    Inlined, so a literal n gives a fixed trip count.
+    """
+    if n < 3:
+        return 0.0
+    x0, y0, z0 = V[k, 0, 0], V[k, 0, 1], V[k, 0, 2]
+    # Each triangle's excess is 2*arg(den + i*num); multiply those complex
+    # numbers up and take a single atan2 at the end.
+    re = 1.0
+    im = 0.0
+    for i in range(1, n - 1):
+        ax, ay, az = V[k, i, 0], V[k, i, 1], V[k, i, 2]
+        bx, by, bz = V[k, i + 1, 0], V[k, i + 1, 1], V[k, i + 1, 2]
+        num = x0 * (ay * bz - az * by) + y0 * (az * bx - ax * bz) + z0 * (ax * by - ay * bx)
+        den = 1.0 + (x0 * ax + y0 * ay + z0 * az) + (x0 * bx + y0 * by + z0 * bz) + (ax * bx + ay * by + az * bz)
+        re, im = re * den - im * num, re * num + im * den
+        # Rescale by a power of two (exact) before the product over/underflows
+        mag = max(abs(re), abs(im))
+        if mag > 1e150:
+            re *= 2.0 ** -500
+            im *= 2.0 ** -500
+        elif 0.0 < mag < 1e-150:
+            re *= 2.0 ** 500
+            im *= 2.0 ** 500
+    return abs(2.0 * math.atan2(im, re))
+
+
+@njit(cache=True)
+def _area_kernel(V, counts):
+    """
+    Unit-sphere areas of a batch of polygons given as a zero-padded (K, Nmax, 3)
+    float64 array of unit vectors and their vertex counts.
+    """
+    K = V.shape[0]
+    areas = np.zeros(K)
+    for k in range(K):
+        areas[k] = _fan_area(V, k, counts[k])
+    return areas
+
+
+def make_fixed_area_kernel(n):
+    """
+    Plain-Python batch area kernel for polygons of exactly n vertices, for
+    build_kernels.py to compile: n is a compile-time constant, so the fan
+    loop can be fully unrolled and vectorized.
+    """
+    def area_fixed(V):
+        K = V.shape[0]
+        areas = np.empty(K)
+        for k in range(K):
+            areas[k] = _fan_area(V, k, n)
+        return areas
+    return area_fixed
+
+
+@njit(cache=True)
+def _centroid_kernel(V, counts):
+    """Centroid lats, lons in degrees of a padded batch, as kml_area._batch_centroids."""
+    K = V.shape[0]
+    lats = np.zeros(K)
+    lons = np.zeros(K)
+    for k in range(K):
+        n = counts[k]
+        if n == 0:
+            continue
+        x = y = z = 0.0
+        for i in range(n):
+            x += V[k, i, 0]
+            y += V[k, i, 1]
+            z += V[k, i, 2]
+        x /= n
+        y /= n
+        z /= n
+        hyp = math.hypot(x, y)
+        lats[k] = math.degrees(math.atan2(z, hyp))
+        lons[k] = math.degrees(math.atan2(y, x))
+    return lats, lons
+
+
+# Compile (or load from cache) now rather than on the first real polygon.
+_dummy = np.eye(3)[None]
+_area_kernel(_dummy, np.array([3], dtype=np.int64))
+_centroid_kernel(_dummy, np.array([3], dtype=np.int64))
+del _dummy
@@ -8,7 +8,17 @@ Run with:
 """
 import streamlit as st
 import zipfile, io, os, tempfile
-from kml_area import summarize_kml_folder, write_csv
+from concurrent.futures import ProcessPoolExecutor
+
+# Keep Numba's compiled kernels on disk across sessions; must be set before
+# kml_area (and so Numba) is imported.
+os.environ.setdefault("NUMBA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "kml_numba_cache"))
+from kml_area import summarize_kml_zip, write_csv
+
+@st.cache_resource
+def get_pool():
+    """One worker pool shared by all uploads, so workers stay warm."""
+    return ProcessPoolExecutor(max_workers=os.cpu_count())
 
 st.title("KML Polygon Area Calculator")
 st.write("Upload a ZIP of your KML folder. We'll compute area (ha) and centroid for each polygon.")
@@ -17,14 +27,10 @@ uploaded = st.file_uploader("Upload KML folder as .zip", type=["zip"])
 
 if uploaded is not None:
     with tempfile.TemporaryDirectory() as tmpdir:
-        zpath = os.path.join(tmpdir, "in.zip")
-        with open(zpath, "wb") as f:
-            f.write(uploaded.read())
-        with zipfile.ZipFile(zpath) as zf:
-            zf.extractall(os.path.join(tmpdir, "unzipped"))
-        rows = summarize_kml_folder(os.path.join(tmpdir, "unzipped"))
         out_csv = os.path.join(tmpdir, "results.csv")
-        write_csv(rows, out_csv)
-        st.success(f"Processed {len(rows)} polygons.")
+        # KML members are parsed straight out of the uploaded archive
+        with zipfile.ZipFile(uploaded) as zf:
+            count = write_csv(summarize_kml_zip(zf, pool=get_pool()), out_csv)
+        st.success(f"Processed {count} polygons.")
         with open(out_csv, "rb") as f:
             st.download_button("Download results CSV", f, file_name="kml_areas.csv")